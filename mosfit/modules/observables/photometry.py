@@ -1,5 +1,4 @@
 """Definitions for the `Photometry` class."""
-import csv
 import json
 import os
 import shutil
@@ -13,7 +12,8 @@ from astropy.io.votable import parse as voparse
 from mosfit.constants import (ANG_CGS, C_CGS, FOUR_PI, H_C_ANG_CGS, MAG_FAC,
                               MPC_CGS)
 from mosfit.modules.module import Module
-from mosfit.utils import get_url_file_handle, listify, open_atomic, syst_syns
+from mosfit.utils import (get_url_file_handle, listify, open_atomic,
+                          syst_syns, trapz_weights)
 
 
 # Important: Only define one ``Module`` class per file.
@@ -45,10 +45,10 @@ class Photometry(Module):
                 rules_path = os.path.join(self._dir_path, 'filterrules.json')
             with open(rules_path) as f:
                 filterrules = json.load(f, object_pairs_hook=OrderedDict)
-            for rank in range(1, self._pool.size + 1):
-                self._pool.comm.send(filterrules, dest=rank, tag=5)
         else:
-            filterrules = self._pool.comm.recv(source=0, tag=5)
+            filterrules = None
+        if self._pool.size > 0:
+            filterrules = self._pool.comm.bcast(filterrules, root=0)
 
         for bi, band in enumerate(bands):
             for rule in filterrules:
@@ -77,19 +77,33 @@ class Photometry(Module):
                             band_list.append(new_band)
 
         self._unique_bands = band_list
-        self._band_insts = np.array(
-            [x['instruments'] for x in self._unique_bands], dtype=object)
-        self._band_bsets = np.array(
-            [x['bandsets'] for x in self._unique_bands], dtype=object)
-        self._band_systs = np.array(
-            [x['systems'] for x in self._unique_bands], dtype=object)
-        self._band_teles = np.array(
-            [x['telescopes'] for x in self._unique_bands], dtype=object)
-        self._band_modes = np.array(
-            [x['modes'] for x in self._unique_bands], dtype=object)
-        self._band_names = np.array(
-            [x['name'] for x in self._unique_bands], dtype=object)
         self._n_bands = len(self._unique_bands)
+
+        # Split the band properties into one array per property in a single
+        # pass, plus a structured array of the same properties (lowercase
+        # except for the case-sensitive name) for `find_band_index`.
+        prop_keys = [
+            'name', 'systems', 'modes', 'instruments', 'telescopes',
+            'bandsets']
+        props = list(zip(*[
+            [x[k] for k in prop_keys] for x in self._unique_bands])) or [
+                [] for k in prop_keys]
+        (self._band_names, self._band_systs, self._band_modes,
+         self._band_insts, self._band_teles, self._band_bsets) = [
+            np.array(x, dtype=object) for x in props]
+        lprops = [np.array(props[0], dtype=str)] + [
+            np.array([y.lower() for y in x], dtype=str) for x in props[1:]]
+        self._band_props = np.empty(self._n_bands, dtype=[
+            (k, x.dtype) for k, x in zip(prop_keys, lprops)])
+        for k, x in zip(prop_keys, lprops):
+            self._band_props[k] = x
+        self._band_name_indices = OrderedDict()
+        for bi, name in enumerate(self._band_names):
+            self._band_name_indices.setdefault(name, []).append(bi)
+        for name in self._band_name_indices:
+            self._band_name_indices[name] = np.array(
+                self._band_name_indices[name])
+
         self._band_wavelengths = [[] for i in range(self._n_bands)]
         self._band_energies = [[] for i in range(self._n_bands)]
         self._transmissions = [[] for i in range(self._n_bands)]
@@ -98,6 +112,7 @@ class Photometry(Module):
         self._max_waves = np.full(self._n_bands, 0.0)
         self._imp_waves = [[0.0, 1.0] for i in range(self._n_bands)]
         self._filter_integrals = np.full(self._n_bands, 0.0)
+        self._inv_filter_integrals = np.full(self._n_bands, 0.0)
         self._count_integrals = np.full(self._n_bands, 0.0)
         self._average_wavelengths = np.full(self._n_bands, 0.0)
         self._band_offsets = np.full(self._n_bands, 0.0)
@@ -107,6 +122,16 @@ class Photometry(Module):
         self._band_yu = np.full(self._n_bands, 1.0)
         self._band_kinds = np.full(self._n_bands, 'magnitude', dtype=object)
         self._band_index_cache = {}
+        self._cached_wavelengths = None
+        self._sample_wavelengths = np.array([])
+        self._trapz_weights = np.array([])
+        self._cached_band_indices = None
+        self._trans_cache = {}
+        self._area_cache = {}
+        self._mag_groups = None
+        self._count_groups = None
+        self._eff_fluxes = np.array([])
+        self._offsets = np.array([])
         self._warned_mismatch = False
         self._zps = np.full(self._n_bands, 0.0)
 
@@ -124,11 +149,12 @@ class Photometry(Module):
         prt = self._printer
 
         if self._pool.is_master():
-            vo_tabs = OrderedDict()
+            svo_zps = OrderedDict()
 
         per = 0.0
         bc = 0
         band_set = set(band_indices)
+        band_rows = OrderedDict()
         for i, band in enumerate(self._unique_bands):
             if len(band_indices) and i not in band_set:
                 continue
@@ -176,10 +202,33 @@ class Photometry(Module):
                                         shutil.copyfileobj(response, f)
 
                         if os.path.exists(xml_install_path):
-                            already_written = svopath in vo_tabs
-                            if not already_written:
-                                vo_tabs[svopath] = voparse(xml_install_path)
-                            vo_tab = vo_tabs[svopath]
+                            svo_xml_path = xml_install_path
+                        elif os.path.exists(xml_path):
+                            svo_xml_path = xml_path
+                        else:
+                            raise RuntimeError(
+                                prt.string('cant_read_svo'))
+
+                        # Zero points are cached alongside the `.dat` file so
+                        # that the VOTable only needs to be parsed when it is
+                        # newer than the files derived from it.
+                        zp_path = os.path.join(
+                            self._filter_run_path, 'filters',
+                            svopath.replace('/', '_') + '.zp.json')
+
+                        zp_cached = (
+                            os.path.exists(path) and
+                            os.path.exists(zp_path) and
+                            os.path.getmtime(zp_path) >=
+                            os.path.getmtime(svo_xml_path))
+
+                        if svopath in svo_zps:
+                            pass
+                        elif zp_cached:
+                            with open(zp_path, 'r') as f:
+                                svo_zps[svopath] = json.load(f)['zpfluxes']
+                        else:
+                            vo_tab = voparse(svo_xml_path)
                             # need to account for zeropoint type
 
                             for resource in vo_tab.resources:
@@ -188,19 +237,9 @@ class Photometry(Module):
                                 else:
                                     params = resource.params
 
-                            oldzplen = len(zps)
-                            for param in params:
-                                if param.name == 'ZeroPoint':
-                                    zpfluxes.append(param.value)
-                                    if sys != 'AB':
-                                        # 0th element is AB flux
-                                        zps.append(2.5 * np.log10(
-                                            zpfluxes[0] / zpfluxes[-1]))
-                                else:
-                                    continue
-                            if sys != 'AB' and len(zps) == oldzplen:
-                                raise RuntimeError(
-                                    'ZeroPoint not found in XML.')
+                            svo_zps[svopath] = [
+                                float(param.value) for param in params
+                                if param.name == 'ZeroPoint']
 
                             vo_dat = vo_tab.get_first_table().array
                             bi = max(
@@ -220,57 +259,21 @@ class Photometry(Module):
                                     not os.path.exists(path)):
                                 with open_atomic(path, 'w') as f:
                                     f.write(vo_string)
-
-                        elif os.path.exists(xml_path):
-                            already_written = svopath in vo_tabs
-                            if not already_written:
-                                vo_tabs[svopath] = voparse(xml_path)
-                            vo_tab = vo_tabs[svopath]
-                            # need to account for zeropoint type
-
-                            for resource in vo_tab.resources:
-                                if len(resource.params) == 0:
-                                    params = vo_tab.get_first_table().params
-                                else:
-                                    params = resource.params
-
-                            oldzplen = len(zps)
-                            for param in params:
-                                if param.name == 'ZeroPoint':
-                                    zpfluxes.append(param.value)
-                                    if sys != 'AB':
-                                        # 0th element is AB flux
-                                        zps.append(2.5 * np.log10(
-                                            zpfluxes[0] / zpfluxes[-1]))
-                                else:
-                                    continue
-                            if sys != 'AB' and len(zps) == oldzplen:
-                                raise RuntimeError(
-                                    'ZeroPoint not found in XML.')
-
-                            if not already_written:
-                                vo_dat = vo_tab.get_first_table().array
-                                bi = max(
-                                    next((i for i, x in enumerate(vo_dat)
-                                          if x[1]), 0) - 1, 0)
-                                ei = -max(
-                                    next((i
-                                          for i, x in enumerate(
-                                              reversed(vo_dat))
-                                          if x[1]), 0) - 1, 0)
-                                vo_dat = vo_dat[bi:ei if ei else len(vo_dat)]
-                                vo_string = '\n'.join([
-                                    ' '.join([str(y) for y in x])
-                                    for x in vo_dat
-                                ])
-                                if (not self._model._fitter._prefer_cache or
-                                        not os.path.exists(path)):
-                                    with open_atomic(path, 'w') as f:
-                                        f.write(vo_string)
-
-                        else:
+                            with open_atomic(zp_path, 'w') as f:
+                                json.dump(
+                                    {'zpfluxes': svo_zps[svopath]}, f)
+
+                        oldzplen = len(zps)
+                        for zpflux in svo_zps[svopath]:
+                            zpfluxes.append(zpflux)
+                            if sys != 'AB':
+                                # 0th element is AB flux
+                                zps.append(2.5 * np.log10(
+                                    zpfluxes[0] / zpfluxes[-1]))
+                        if sys != 'AB' and len(zps) == oldzplen:
                             raise RuntimeError(
-                                prt.string('cant_read_svo'))
+                                'ZeroPoint not found in XML.')
+
                     self._unique_bands[i]['origin'] = band['SVO']
                 elif all(x in band for x in [
                         'min_wavelength', 'max_wavelength',
@@ -282,7 +285,7 @@ class Photometry(Module):
                     rows = np.array(
                         [np.linspace(
                             band['min_wavelength'], band['max_wavelength'],
-                            nbins), np.full(nbins, 1.0)]).T.tolist()
+                            nbins), np.full(nbins, 1.0)]).T
                     self._unique_bands[i]['origin'] = 'generated'
                 elif 'path' in band:
                     self._unique_bands[i]['origin'] = band['path']
@@ -291,22 +294,19 @@ class Photometry(Module):
                     raise RuntimeError(prt.text('bad_filter_rule'))
 
                 if path:
-                    with open(path, 'r') as f:
-                        rows = []
-                        for row in csv.reader(
-                                f, delimiter=' ', skipinitialspace=True):
-                            rows.append([float(x) for x in row[:2]])
-                for rank in range(1, self._pool.size + 1):
-                    self._pool.comm.send(rows, dest=rank, tag=3)
-                    self._pool.comm.send(zps, dest=rank, tag=4)
-            else:
-                rows = self._pool.comm.recv(source=0, tag=3)
-                zps = self._pool.comm.recv(source=0, tag=4)
+                    rows = np.loadtxt(path, usecols=(0, 1), ndmin=2)
+                band_rows[i] = (rows, zps)
+            bc = bc + 1
+
+        # Send all of the loaded filter curves to the workers at once.
+        if self._pool.size > 0:
+            band_rows = self._pool.comm.bcast(band_rows, root=0)
 
-            xvals, yvals = list(
-                map(list, zip(*rows)))
-            xvals = np.array(xvals)
-            yvals = np.array(yvals)
+        for i, (rows, zps) in band_rows.items():
+            band = self._unique_bands[i]
+            rows = np.array(rows, dtype=np.float64)
+            xvals = np.ascontiguousarray(rows[:, 0])
+            yvals = np.ascontiguousarray(rows[:, 1])
 
             if '{0}'.format(self._band_yunits[i]) == 'cm2':
                 xscale = (c.h * c.c /
@@ -314,30 +314,26 @@ class Photometry(Module):
                 self._band_energies[
                     i], self._band_areas[i] = xvals, yvals / xvals
                 self._band_wavelengths[i] = xscale / self._band_energies[i]
-                self._average_wavelengths[i] = np.trapz([
-                    x * y
-                    for x, y in zip(
+                self._average_wavelengths[i] = np.trapz(
+                    self._band_areas[i] * self._band_wavelengths[i],
+                    self._band_wavelengths[i]) / np.trapz(
                         self._band_areas[i], self._band_wavelengths[i])
-                ], self._band_wavelengths[i]) / np.trapz(
-                    self._band_areas[i], self._band_wavelengths[i])
             else:
                 self._band_wavelengths[
                     i], self._transmissions[i] = xvals, yvals
                 self._filter_integrals[i] = self.FLUX_STD * np.trapz(
-                    np.array(self._transmissions[i]) /
-                    np.array(self._band_wavelengths[i]) ** 2,
+                    self._transmissions[i] / self._band_wavelengths[i] ** 2,
                     self._band_wavelengths[i])
+                self._inv_filter_integrals[i] = 1.0 / self._filter_integrals[
+                    i]
                 self._count_integrals[i] = self.FLUX_STD * np.trapz(
-                    np.array(self._transmissions[i]) /
-                    np.array(self._band_wavelengths[i]) ** 2 / (
+                    self._transmissions[i] / self._band_wavelengths[i] ** 2 / (
                         H_C_ANG_CGS / self._band_wavelengths[i]),
                     self._band_wavelengths[i])
-                self._average_wavelengths[i] = np.trapz([
-                    x * y
-                    for x, y in zip(
+                self._average_wavelengths[i] = np.trapz(
+                    self._transmissions[i] * self._band_wavelengths[i],
+                    self._band_wavelengths[i]) / np.trapz(
                         self._transmissions[i], self._band_wavelengths[i])
-                ], self._band_wavelengths[i]) / np.trapz(
-                    self._transmissions[i], self._band_wavelengths[i])
 
                 if 'offset' in band:
                     self._band_offsets[i] = band['offset']
@@ -364,7 +360,8 @@ class Photometry(Module):
                     np.argmax(self._band_areas[i])]
                 self._imp_waves[i].add(new_wave)
             self._imp_waves[i] = list(sorted(self._imp_waves[i]))
-            bc = bc + 1
+
+        self._cached_wavelengths = None
 
         if self._pool.is_master():
             prt.message('band_load_complete', inline=True)
@@ -373,8 +370,6 @@ class Photometry(Module):
             self, band, telescope='', instrument='', mode='', bandset='',
             system=''):
         """Find the index corresponding to the provided band information."""
-        bmatch = 0
-        bbi = None
         cache_key = ':'.join([
             band, telescope, instrument, mode, bandset, system])
         if cache_key in self._band_index_cache:
@@ -382,37 +377,36 @@ class Photometry(Module):
         ltele, linst, lmode, lbset, lsyst = tuple([x.lower() for x in [
             telescope, instrument, mode, bandset, system]])
 
-        for bi, bnd in enumerate(self._unique_bands):
-            # Band name *must* match (case-sensitive), all other matches
-            # optional and case-insensitive.
-            if (band != bnd['name']) and (band != ''):
-                continue
-            nmismatches = sum(
-                [(linst != self._band_insts[bi].lower()) & (
-                    linst != '') & (self._band_insts[bi] != ''),
-                 (ltele != self._band_teles[bi].lower()) & (
-                    ltele != '') & (self._band_teles[bi] != '')])
-            matches = [band == bnd['name'],
-                       lsyst == self._band_systs[bi].lower(),
-                       lmode == self._band_modes[bi].lower(),
-                       linst == self._band_insts[bi].lower(),
-                       ltele == self._band_teles[bi].lower(),
-                       lbset == self._band_bsets[bi].lower()]
-            lmatch = sum(matches)
-            nbmatch = sum(
-                [(band == bnd['name']) & (band != ''),
-                 (lsyst == self._band_systs[bi].lower()) & (lsyst != ''),
-                 (lmode == self._band_modes[bi].lower()) & (lmode != ''),
-                 (linst == self._band_insts[bi].lower()) & (linst != ''),
-                 (ltele == self._band_teles[bi].lower()) & (ltele != ''),
-                 (lbset == self._band_bsets[bi].lower()) & (lbset != '')])
-            if lmatch > bmatch and nbmatch > 0:
-                bmatch = lmatch
-                bbi = bi
-                bmm = nmismatches
-            if lmatch == 6 and nbmatch > 0:
-                break
-        if bbi is not None:
+        # Band name *must* match (case-sensitive), all other matches
+        # optional and case-insensitive.
+        if band == '':
+            candidates = np.arange(self._n_bands)
+        else:
+            candidates = self._band_name_indices.get(band, np.array([], int))
+        props = self._band_props[candidates]
+
+        # Score all candidates at once; the best band is the first one with
+        # the most matching properties, provided at least one of those
+        # matches is a non-empty property.
+        matches = [props['name'] == band,
+                   props['systems'] == lsyst,
+                   props['modes'] == lmode,
+                   props['instruments'] == linst,
+                   props['telescopes'] == ltele,
+                   props['bandsets'] == lbset]
+        lmatch = np.sum(matches, axis=0)
+        nbmatch = np.sum([
+            x & (y != '') for x, y in zip(matches, [
+                band, lsyst, lmode, linst, ltele, lbset])], axis=0)
+        lmatch[nbmatch == 0] = 0
+        if len(lmatch) and np.max(lmatch) > 0:
+            bbi = int(candidates[np.argmax(lmatch)])
+            bprops = self._band_props[bbi]
+            bmm = sum(
+                [(linst != bprops['instruments']) & (
+                    linst != '') & (bprops['instruments'] != ''),
+                 (ltele != bprops['telescopes']) & (
+                    ltele != '') & (bprops['telescopes'] != '')])
             if bmm > 0 and not self._warned_mismatch:
                 self._printer.message('potential_mismatch', reps=[
                     band, instrument, telescope, self._band_insts[bbi],
@@ -444,33 +438,19 @@ class Photometry(Module):
         self._zps = kwargs.get('all_zeropoints', np.zeros_like(
             self._luminosities))
         zp1 = 1.0 + kwargs['redshift']
-        eff_fluxes = np.zeros_like(self._luminosities)
-        offsets = np.zeros_like(self._luminosities)
+        seds = kwargs['seds']
+        sample_wavelengths = kwargs['sample_wavelengths']
+        band_indices = np.asarray(self._band_indices)
+        # Scratch arrays are reused between calls, only the returned
+        # observations are allocated anew.
+        if len(self._eff_fluxes) != len(self._luminosities):
+            self._eff_fluxes = np.zeros(len(self._luminosities))
+            self._offsets = np.zeros(len(self._luminosities))
+        eff_fluxes = self._eff_fluxes
+        offsets = self._offsets
+        eff_fluxes.fill(0.0)
+        offsets.fill(0.0)
         model_observations = np.zeros_like(self._luminosities)
-        for li, lum in enumerate(self._luminosities):
-            bi = self._band_indices[li]
-            if bi >= 0:
-                if (self._observation_types[li] == 'magnitude' or
-                        self._observation_types[li] == 'magcount'):
-                    offsets[li] = self._band_offsets[bi]
-                    wavs = kwargs['sample_wavelengths'][bi]
-                    yvals = np.interp(
-                        wavs, self._band_wavelengths[bi],
-                        self._transmissions[bi]) * kwargs['seds'][li] / zp1
-                    eff_fluxes[li] = np.trapz(
-                        yvals, wavs) / self._filter_integrals[bi]
-                elif self._observation_types[li] == 'countrate':
-                    wavs = np.array(kwargs['sample_wavelengths'][bi])
-                    yvals = np.interp(
-                        wavs, self._band_wavelengths[bi],
-                        self._band_areas[bi]) * kwargs['seds'][li] / zp1 / (
-                            H_C_ANG_CGS / wavs) / ANG_CGS
-                    eff_fluxes[li] = np.trapz(yvals, wavs)
-                else:
-                    raise RuntimeError('Unknown observation kind.')
-            else:
-                eff_fluxes[li] = kwargs['seds'][li][0] / ANG_CGS * (
-                    C_CGS / (self._frequencies[li] ** 2))
         nbs = np.logical_or(
             self._observation_types == 'countrate',
             self._observation_types == 'fluxdensity')
@@ -478,12 +458,98 @@ class Photometry(Module):
             self._observation_types == 'magnitude',
             self._observation_types == 'magcount')
         cbs = self._observation_types == 'magcount'
+        bbs = band_indices >= 0
+        rbs = np.logical_and(bbs, self._observation_types == 'countrate')
+        if np.any(bbs & ~ybs & ~rbs):
+            raise RuntimeError('Unknown observation kind.')
+
+        # The filter weights only depend on the sample wavelengths and on
+        # which band each observation is in, both of which are usually the
+        # same objects between calls.
+        if sample_wavelengths is not self._cached_wavelengths:
+            self._cached_wavelengths = sample_wavelengths
+            self._sample_wavelengths = np.asarray(sample_wavelengths)
+            self._trapz_weights = trapz_weights(self._sample_wavelengths)
+            self._trans_cache = {}
+            self._area_cache = {}
+            self._cached_band_indices = None
+        if self._band_indices is not self._cached_band_indices:
+            self._cached_band_indices = self._band_indices
+            self._mag_groups = None
+            self._count_groups = None
+        sample_wavelengths = self._sample_wavelengths
+
+        # Each filter integral is a dot product of the SED with a vector of
+        # precomputed weights (interpolated filter curve times trapezoidal
+        # quadrature weights, normalized by the filter integral), done
+        # block-wise for all observations sharing a band.
+        lis = np.flatnonzero(ybs & bbs)
+        if len(lis):
+            if (self._mag_groups is None or
+                    len(self._mag_groups[0]) != len(lis)):
+                self._mag_groups = self.band_groups(
+                    lis, sample_wavelengths.shape[-1])
+                for bi, bs, be in self._mag_groups[1]:
+                    if bi in self._trans_cache:
+                        continue
+                    self._trans_cache[bi] = np.interp(
+                        sample_wavelengths[bi], self._band_wavelengths[bi],
+                        self._transmissions[bi]) * self._trapz_weights[
+                            bi] * self._inv_filter_integrals[bi]
+            offsets[lis] = self._band_offsets[band_indices[lis]]
+            glis, fluxes = self.integrate_groups(
+                self._mag_groups, self._trans_cache, seds)
+            eff_fluxes[glis] = fluxes / zp1
+
+        lis = np.flatnonzero(rbs)
+        if len(lis):
+            if (self._count_groups is None or
+                    len(self._count_groups[0]) != len(lis)):
+                self._count_groups = self.band_groups(
+                    lis, sample_wavelengths.shape[-1])
+                for bi, bs, be in self._count_groups[1]:
+                    if bi in self._area_cache:
+                        continue
+                    wavs = sample_wavelengths[bi]
+                    self._area_cache[bi] = np.interp(
+                        wavs, self._band_wavelengths[bi],
+                        self._band_areas[bi]) * wavs * self._trapz_weights[
+                            bi] / (H_C_ANG_CGS * ANG_CGS)
+            glis, fluxes = self.integrate_groups(
+                self._count_groups, self._area_cache, seds)
+            eff_fluxes[glis] = fluxes / zp1
+
+        lis = np.flatnonzero(~bbs)
+        if len(lis):
+            eff_fluxes[lis] = np.array([seds[li][0] for li in lis]) / (
+                ANG_CGS) * (C_CGS / np.asarray(self._frequencies)[lis] ** 2)
+
         model_observations[nbs] = eff_fluxes[nbs] / self._dist_const
         model_observations[ybs] = self.abmag(eff_fluxes[ybs], offsets[ybs])
         model_observations[cbs] = 10.0 ** (-0.4 * (model_observations[
             cbs] - self._zps[cbs]))
         return {'model_observations': model_observations}
 
+    def band_groups(self, indices, n_wavs):
+        """Group observation indices into blocks sharing the same band.
+
+        Also allocates the buffers `integrate_groups` fills for the group.
+        """
+        bis = np.asarray(self._band_indices)[indices]
+        order = np.argsort(bis, kind='mergesort')
+        ubis, starts = np.unique(bis[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        return (indices[order], list(zip(ubis, starts, ends)),
+                np.empty((len(order), n_wavs)), np.empty(len(order)))
+
+    def integrate_groups(self, groups, weights, seds):
+        """Integrate grouped SEDs against per-band quadrature weights."""
+        indices, blocks, sed_arr, fluxes = groups
+        np.concatenate([seds[li] for li in indices], out=sed_arr.reshape(-1))
+        for bi, bs, be in blocks:
+            np.dot(sed_arr[bs:be], weights[bi], out=fluxes[bs:be])
+        return indices, fluxes
+
     def average_wavelengths(self, indices=None):
         """Return average wavelengths for specified band indices."""
         if indices:
@@ -516,8 +582,12 @@ class Photometry(Module):
         """Convert fluxes into AB magnitude."""
         mags = np.full(len(eff_fluxes), np.inf)
         ef_mask = eff_fluxes != 0.0
-        mags[ef_mask] = - offsets[ef_mask] - MAG_FAC * (
-            np.log10(eff_fluxes[ef_mask]) - self._ldist_const)
+        # Evaluated in place on the non-zero fluxes, avoiding the gathers
+        # and scatter of indexing every operand with the mask.
+        np.log10(eff_fluxes, out=mags, where=ef_mask)
+        np.multiply(mags, -MAG_FAC, out=mags, where=ef_mask)
+        np.add(mags, MAG_FAC * self._ldist_const, out=mags, where=ef_mask)
+        np.subtract(mags, offsets, out=mags, where=ef_mask)
         return mags
 
     def set_variance_bands(self, band_pairs):
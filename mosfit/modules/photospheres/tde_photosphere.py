@@ -4,7 +4,8 @@ from math import pi
 # import numexpr as ne
 import numpy as np
 from astropy import constants as c
-from mosfit.constants import C_CGS, DAY_CGS, KM_CGS, M_SUN_CGS  # FOUR_PI
+from mosfit.constants import (C_CGS, DAY_CGS, G_CGS, KM_CGS,  # FOUR_PI
+                              M_SUN_CGS, R_SUN_CGS)
 from mosfit.modules.photospheres.photosphere import Photosphere
 
 
@@ -21,54 +22,76 @@ class TdePhotosphere(Photosphere):
     STEF_CONST = (4.0 * pi * c.sigma_sb).cgs.value
     RAD_CONST = KM_CGS * DAY_CGS
 
+    def __init__(self, **kwargs):
+        """Initialize module."""
+        super(TdePhotosphere, self).__init__(**kwargs)
+        self._a_t_buf = None
+
     def process(self, **kwargs):
         """Process module."""
         kwargs = self.prepare_input('luminosities', **kwargs)
-        self._times = np.array(kwargs['rest_times'])
+        self._times = np.asarray(kwargs['rest_times'])
         self._Mh = kwargs['bhmass']
         self._Mstar = kwargs['starmass']
         self._l = kwargs['lphoto']
         self._Rph_0 = kwargs['Rph0']
-        self._luminosities = np.array(kwargs['luminosities'])
+        self._luminosities = np.asarray(kwargs['luminosities'])
         self._rest_t_explosion = kwargs['resttexplosion']
         self._beta = kwargs['beta']  # for now linearly interp between
         # beta43 and beta53 for a given 'b' if Mstar is in transition region
 
-        Rsolar = c.R_sun.cgs.value
-        self._Rstar = kwargs['Rstar'] * Rsolar
+        self._Rstar = kwargs['Rstar'] * R_SUN_CGS
 
         # Assume solar metallicity for now
         kappa_t = 0.2 * (1 + 0.74)  # 0.2*(1 + X) = mean Thomson opacity
         tpeak = kwargs['tpeak']
 
-        Ledd = (4 * np.pi * c.G.cgs.value * self._Mh * M_SUN_CGS *
-                C_CGS / kappa_t)
+        # Gravitational parameter of the black hole, shared by most of the
+        # length scales below.
+        gm = G_CGS * self._Mh * M_SUN_CGS
+
+        Ledd = 4 * np.pi * gm * C_CGS / kappa_t
 
-        rt = (self._Mh / self._Mstar)**(1. / 3.) * self._Rstar
+        rt = np.cbrt(self._Mh / self._Mstar) * self._Rstar
         self._rp = rt / self._beta
 
-        r_isco = 6 * c.G.cgs.value * self._Mh * M_SUN_CGS / (C_CGS * C_CGS)
+        r_isco = 6 * gm / (C_CGS * C_CGS)
         rphotmin = r_isco
 
-        a_p = (c.G.cgs.value * self._Mh * M_SUN_CGS * ((
-            tpeak - self._rest_t_explosion) * DAY_CGS / np.pi)**2)**(1. / 3.)
+        a_p = np.cbrt(gm * ((
+            tpeak - self._rest_t_explosion) * DAY_CGS / np.pi)**2)
 
         # semi-major axis of material that accretes at self._times,
         # only calculate for times after first mass accretion
-        a_t = (c.G.cgs.value * self._Mh * M_SUN_CGS * ((
-            self._times - self._rest_t_explosion) * DAY_CGS / np.pi)**2)**(
-                1. / 3.)
-        a_t[self._times < self._rest_t_explosion] = 0.0
-
-        rphotmax = self._rp + 2 * a_t
+        # (built in place in a scratch buffer that is reused between calls,
+        # `a_t` is only an intermediate and is never returned).
+        n = len(self._times)
+        if self._a_t_buf is None or self._a_t_buf.size != n:
+            self._a_t_buf = np.empty(n)
+        a_t = self._a_t_buf
+        np.subtract(self._times, self._rest_t_explosion, out=a_t)
+        np.maximum(a_t, 0.0, out=a_t)
+        a_t *= DAY_CGS / np.pi
+        np.square(a_t, out=a_t)
+        a_t *= gm
+        np.cbrt(a_t, out=a_t)
+
+        rphotmax = a_t
+        rphotmax *= 2
+        rphotmax += self._rp
 
         # adding rphotmin on to rphot for soft min
         # also creating soft max -- inverse( 1/rphot + 1/rphotmax)
-        rphot = self._Rph_0 * a_p * (self._luminosities / Ledd)**self._l
+        rphot = (self._luminosities / Ledd)**self._l
+        rphot *= self._Rph_0 * a_p
 
-        rphot = (rphot * rphotmax) / (rphot + rphotmax) + rphotmin
+        rphot = rphot * rphotmax / (rphot + rphotmax) + rphotmin
 
-        Tphot = (self._luminosities / (rphot**2 * self.STEF_CONST))**0.25
+        Tphot = np.square(rphot)
+        Tphot *= self.STEF_CONST
+        np.divide(self._luminosities, Tphot, out=Tphot)
+        np.sqrt(Tphot, out=Tphot)
+        np.sqrt(Tphot, out=Tphot)
 
         return {'radiusphot': rphot, 'temperaturephot': Tphot,
                 'rp': self._rp}
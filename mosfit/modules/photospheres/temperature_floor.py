@@ -28,37 +28,28 @@ class TemperatureFloor(Photosphere):
         """Process module."""
         kwargs = self.prepare_input(self.key('luminosities'), **kwargs)
         self._rest_t_explosion = kwargs[self.key('resttexplosion')]
-        self._times = kwargs[self.key('rest_times')]
-        self._luminosities = kwargs[self.key('luminosities')]
+        self._times = np.asarray(kwargs[self.key('rest_times')])
+        self._luminosities = np.asarray(kwargs[self.key('luminosities')])
         self._temperature = kwargs[self.key('temperature')]
         self._v_ejecta = kwargs[self.key('vejecta')]
         self._m_ejecta = kwargs[self.key('mejecta')]
         self._kappa = kwargs[self.key('kappa')]
-        self._radius2 = [(self.RAD_CONST *
-                          self._v_ejecta * max(
-                              x - self._rest_t_explosion, 0.0)) ** 2
-                         for x in self._times]
-        self._rec_radius2 = [
-            x / (self.STEF_CONST * self._temperature ** 4)
-            for x in self._luminosities
-        ]
-        rphot = []
-        Tphot = []
-        for li, lum in enumerate(self._luminosities):
-
-            radius2 = self._radius2[li]
-            rec_radius2 = self._rec_radius2[li]
-            if lum == 0.0:
-                temperature = 0.0
-            elif radius2 < rec_radius2:
-                temperature = (lum / (self.STEF_CONST * radius2)) ** 0.25
-            else:
-                radius2 = rec_radius2
-                temperature = self._temperature
-
-            rphot.append(np.sqrt(radius2))
-
-            Tphot.append(temperature)
+        radius2 = (self.RAD_CONST * self._v_ejecta * np.maximum(
+            self._times - self._rest_t_explosion, 0.0)) ** 2
+        rec_radius2 = self._luminosities / (
+            self.STEF_CONST * self._temperature ** 4)
+
+        # Once the expanding photosphere would be cooler than the floor, it
+        # recedes at the floor temperature instead.
+        zero_lum = self._luminosities == 0.0
+        floored = np.logical_and(radius2 >= rec_radius2, ~zero_lum)
+        radius2 = np.where(floored, rec_radius2, radius2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Tphot = np.where(floored, self._temperature, np.sqrt(np.sqrt(
+                self._luminosities / (self.STEF_CONST * radius2))))
+        Tphot[zero_lum] = 0.0
+
+        rphot = np.sqrt(radius2)
 
         return {self.key('radiusphot'): rphot,
                 self.key('temperaturephot'): Tphot}
@@ -260,6 +260,19 @@ def rebin(a, newshape):
     return a[tuple(indices)]
 
 
+def trapz_weights(x):
+    """Return weights `w` such that `np.dot(w, y) == np.trapz(y, x)`.
+
+    For multidimensional `x` the weights are computed along the last axis.
+    """
+    x = np.asarray(x, dtype=float)
+    w = np.zeros_like(x)
+    dx = np.diff(x)
+    w[..., :-1] += 0.5 * dx
+    w[..., 1:] += 0.5 * dx
+    return w
+
+
 def congrid(a, newdims, method='linear', center=False, minusone=False,
             bounds_error=False):
     """Arbitrary resampling of source array to new dimension sizes.